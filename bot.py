@@ -26,7 +26,10 @@ from handlers.command_handler import (
 )
 from handlers.link_handler import handle_link
 from handlers.qa_handler import handle_question
+from services import llm, transcript
 from services import session as sess
+from services.cache import transcript_cache
+from services.llm_cache import llm_cache, task_cache
 
 # ── Logging ───────────────────────────────────────────────────────────────
 logging.basicConfig(
@@ -38,6 +41,8 @@ logger = logging.getLogger(__name__)
 # ── Load environment variables ─────────────────────────────────────────────
 load_dotenv()
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")      # optional: public HTTPS base URL
+PORT = int(os.getenv("PORT", "8443"))
 
 if not TELEGRAM_TOKEN:
     raise ValueError(
@@ -51,6 +56,8 @@ async def route_message(update: Update, context) -> None:
     """Route text messages: YouTube URL → link_handler, else → qa_handler."""
     from utils.url_parser import is_youtube_url
     text = update.message.text or ""
+    # Normalize once here; handlers reuse it instead of lowercasing again
+    context.user_data["_norm_text"] = text.strip().lower()
     if is_youtube_url(text):
         await handle_link(update, context)
     else:
@@ -72,25 +79,45 @@ async def error_handler(update: object, context) -> None:
 
 # ── Periodic cleanup job ─────────────────────────────────────────────────
 async def cleanup_job(context) -> None:
-    """Runs every 30 minutes: removes expired sessions from memory."""
+    """Runs every 30 minutes: removes expired sessions and cache entries from memory."""
     removed = sess.cleanup_expired()
     active = sess.active_session_count()
     if removed > 0:
         logger.info(f"Session cleanup: removed {removed} expired sessions, {active} active")
 
+    transcripts_removed = transcript_cache.sweep_expired()
+    responses_removed = llm_cache.sweep_expired() + task_cache.sweep_expired()
+    if transcripts_removed or responses_removed:
+        logger.info(
+            f"Cache cleanup: removed {transcripts_removed} expired transcripts, "
+            f"{responses_removed} expired LLM responses"
+        )
+
+# ── Shutdown hook ─────────────────────────────────────────────────────────
+async def post_shutdown(app) -> None:
+    """Close the pooled Groq and YouTube HTTP clients."""
+    await llm.aclose()
+    transcript.close()
+
+
 def main() -> None:
-    # Use larger timeouts to handle slow connections / Gemini processing time
+    # One shared HTTP/2 transport for all Bot API calls: sendMessage / editMessageText
+    # (many per streamed reply) are multiplexed over a single TLS connection
     request = HTTPXRequest(
-        connect_timeout=30.0,
-        read_timeout=60.0,
-        write_timeout=60.0,
-        pool_timeout=60.0,
+        connect_timeout=15.0,
+        read_timeout=50.0,
+        write_timeout=20.0,
+        pool_timeout=20.0,
+        http_version="2",
+        connection_pool_size=256,
     )
 
     app = (
         ApplicationBuilder()
         .token(TELEGRAM_TOKEN)
         .request(request)
+        .concurrent_updates(True)   # process chats in parallel, not one at a time
+        .post_shutdown(post_shutdown)
         .build()
     )
 
@@ -113,12 +140,32 @@ def main() -> None:
     # Global error handler — keeps bot alive on network errors
     app.add_error_handler(error_handler)
 
+    if WEBHOOK_URL:
+        # Webhook mode: Telegram pushes each update to us as an HTTPS POST —
+        # no polling loop, so delivery latency is just the network hop.
+        # The token is used as the secret URL path.
+        logger.info(f"🚀 Bot is running (webhook on port {PORT}). Press Ctrl+C to stop.")
+        app.run_webhook(
+            listen="0.0.0.0",
+            port=PORT,
+            url_path=TELEGRAM_TOKEN,
+            webhook_url=f"{WEBHOOK_URL.rstrip('/')}/{TELEGRAM_TOKEN}",
+            allowed_updates=Update.ALL_TYPES,
+            drop_pending_updates=True,
+        )
+        return
+
     logger.info("🚀 Bot is running. Press Ctrl+C to stop.")
+    # timeout = how long Telegram holds each getUpdates open waiting for new
+    # messages (server-side long poll). A longer hold means fewer idle
+    # round-trips; poll_interval=0 re-polls immediately after each batch.
+    # PTB adds this timeout on top of the getUpdates read timeout, so the
+    # held connection is never cut short client-side.
     app.run_polling(
         allowed_updates=Update.ALL_TYPES,
         drop_pending_updates=True,   # ignore messages sent while bot was offline
-        poll_interval=2.0,
-        timeout=20,
+        poll_interval=0.0,
+        timeout=50,
     )
 
 
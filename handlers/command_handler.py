@@ -7,8 +7,11 @@ from telegram import Update
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 
-from services.llm import deepdive, action_points
+from services.llm import deepdive_stream, action_points_stream
 from services import session as sess
+from utils.telegram_helpers import stream_to_message
+
+_STILL_LOADING = "⏳ Still processing your video — try again in a moment."
 
 
 # ── /start ────────────────────────────────────────────────────────────────
@@ -45,7 +48,10 @@ async def cmd_summary(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     chat_id = update.effective_chat.id
     session = sess.get_session(chat_id)
 
-    if not sess.has_video(chat_id) or not session.summary:
+    if session.state == "loading":
+        await update.message.reply_text(_STILL_LOADING)
+        return
+    if session.state != "ready":
         await update.message.reply_text(
             "📹 No video loaded yet. Send me a YouTube link first!"
         )
@@ -60,14 +66,18 @@ async def cmd_deepdive(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     chat_id = update.effective_chat.id
     session = sess.get_session(chat_id)
 
-    if not sess.has_video(chat_id):
+    if session.state == "loading":
+        await update.message.reply_text(_STILL_LOADING)
+        return
+    if session.state != "ready":
         await update.message.reply_text("📹 Please send a YouTube link first!")
         return
 
     loading = await update.message.reply_text("🔍 Running deep analysis…")
     try:
-        result = deepdive(session.transcript, language=session.language)
-        await loading.edit_text(result, parse_mode=ParseMode.MARKDOWN)
+        await stream_to_message(
+            loading, deepdive_stream(session.video_id, session.transcript_head, language=session.language)
+        )
     except Exception as e:
         await loading.edit_text(f"❌ Error: {str(e)}")
 
@@ -78,14 +88,18 @@ async def cmd_actionpoints(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     chat_id = update.effective_chat.id
     session = sess.get_session(chat_id)
 
-    if not sess.has_video(chat_id):
+    if session.state == "loading":
+        await update.message.reply_text(_STILL_LOADING)
+        return
+    if session.state != "ready":
         await update.message.reply_text("📹 Please send a YouTube link first!")
         return
 
     loading = await update.message.reply_text("✅ Extracting action points…")
     try:
-        result = action_points(session.transcript, language=session.language)
-        await loading.edit_text(result, parse_mode=ParseMode.MARKDOWN)
+        await stream_to_message(
+            loading, action_points_stream(session.video_id, session.transcript_head, language=session.language)
+        )
     except Exception as e:
         await loading.edit_text(f"❌ Error: {str(e)}")
 
@@ -6,26 +6,30 @@ Architecture:
 - Checks TranscriptCache before fetching from YouTube (avoids redundant API calls)
 - If cached: serves transcript immediately, regenerates summary only if needed
 - If not cached: fetches from YouTube, stores in cache for future users
+- YouTube fetches (worker thread, coalesced per video) and Groq calls are
+  async, so other chats keep being served meanwhile
 """
 
-import asyncio
 from telegram import Update
 from telegram.ext import ContextTypes
 
 from utils.url_parser import extract_video_id
 from services.transcript import get_transcript
-from services.llm import summarize, detect_language_request
+from services.llm import summarize, summarize_stream, detect_language_request
 from services.cache import transcript_cache
+from services.llm_cache import Uncacheable
 from services import session as sess
-from utils.telegram_helpers import edit_or_send_long
+from utils.telegram_helpers import edit_or_send_long, stream_to_message
 
 
 async def handle_link(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     chat_id = update.effective_chat.id
     message_text = update.message.text.strip()
+    session = sess.get_session(chat_id)
 
-    requested_lang = detect_language_request(message_text)
-    language = requested_lang or sess.get_session(chat_id).language
+    normalized = context.user_data.pop("_norm_text", None) or message_text.lower()
+    requested_lang = detect_language_request(normalized)
+    language = requested_lang or session.language
 
     video_id = extract_video_id(message_text)
     if not video_id:
@@ -33,8 +37,7 @@ async def handle_link(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         return
 
     # Same video already in THIS user's session? Just remind them
-    current = sess.get_session(chat_id)
-    if current.video_id == video_id and current.transcript:
+    if session.video_id == video_id and session.state == "ready":
         await update.message.reply_text(
             "ℹ️ This video is already loaded. Ask me anything, or /summary to re-read the summary."
         )
@@ -52,19 +55,20 @@ async def handle_link(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
 
     if cached:
         # Cache HIT — transcript already fetched by a previous user or request
-        transcript = cached.transcript
-        lang_code = cached.language_code
+        entry = cached
+        head = cached.head
+        word_count = cached.word_count
         if loading_msg:
             try:
                 await loading_msg.edit_text(
-                    f"⚡ Transcript loaded from cache ({len(transcript.split())} words). Generating summary…"
+                    f"⚡ Transcript loaded from cache ({word_count} words). Generating summary…"
                 )
             except Exception:
                 pass
     else:
         # Cache MISS — fetch from YouTube
         try:
-            transcript, lang_code = get_transcript(video_id)
+            entry = await get_transcript(video_id)
         except ValueError as e:
             msg = str(e)
             if loading_msg:
@@ -73,25 +77,34 @@ async def handle_link(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
                 await update.message.reply_text(msg)
             return
 
-        # Store in global cache for future requests
-        transcript_cache.set(video_id, transcript, lang_code)
+        # get_transcript() already stored it in the global cache for future requests
+        head = entry.head
+        word_count = entry.word_count
 
         if loading_msg:
             try:
                 await loading_msg.edit_text(
-                    f"✅ Transcript fetched ({len(transcript.split())} words). Generating summary…"
+                    f"✅ Transcript fetched ({word_count} words). Generating summary…"
                 )
             except Exception:
                 pass
 
     # ── Step 2: Get summary (use cached English summary if available + English requested) ──
+    streamed = False
     if cached and cached.summary and language == "English":
         # Reuse cached summary — no LLM call needed!
         summary = cached.summary
     else:
-        # Generate fresh summary
+        # Generate fresh summary, streaming it into the loading message as it arrives
+        session.begin_load()
         try:
-            summary = summarize(transcript, language=language)
+            if loading_msg:
+                summary = await stream_to_message(
+                    loading_msg, summarize_stream(video_id, head, language=language)
+                )
+                streamed = True
+            else:
+                summary = await summarize(video_id, head, language=language)
         except Exception as e:
             err = f"❌ Failed to generate summary: {str(e)}"
             if loading_msg:
@@ -99,20 +112,23 @@ async def handle_link(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
             else:
                 await update.message.reply_text(err)
             return
+        finally:
+            # On failure the previous video (if any) stays usable
+            session.end_load()
 
-        # Cache English summary for future users of same video
-        if language == "English":
+        # Cache English summary for future users of same video (never fallback-model output)
+        if language == "English" and not isinstance(summary, Uncacheable):
             transcript_cache.set_summary(video_id, summary)
 
     # ── Step 3: Store in user session ─────────────────────────────────────────
-    sess.update_video(chat_id, video_id, transcript, summary)
+    sess.update_video(chat_id, video_id, entry, summary)
     if requested_lang:
         sess.update_language(chat_id, requested_lang)
 
-    # ── Step 4: Send summary ───────────────────────────────────────────────────
-    if loading_msg:
+    # ── Step 4: Send summary (already on screen if it was streamed) ───────────
+    if loading_msg and not streamed:
         await edit_or_send_long(loading_msg, summary)
-    else:
+    elif not loading_msg:
         await update.message.reply_text(summary)
 
     try:
@@ -7,9 +7,9 @@ from telegram import Update
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
 
-from services.llm import answer_question, detect_language_request, translate_summary
+from services.llm import answer_question_stream, detect_language_request, translate_summary_stream
 from services import session as sess
-from utils.telegram_helpers import edit_or_send_long
+from utils.telegram_helpers import stream_to_message
 
 
 async def handle_question(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -18,11 +18,19 @@ async def handle_question(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     session = sess.get_session(chat_id)
 
     # ── Language switch? ──────────────────────────────────────────────────────
-    lang_request = detect_language_request(question)
+    normalized = context.user_data.pop("_norm_text", None) or question.lower()
+    lang_request = detect_language_request(normalized)
     if lang_request:
         sess.update_language(chat_id, lang_request)
 
-        if not sess.has_video(chat_id) or not session.summary:
+        if session.state == "loading":
+            await update.message.reply_text(
+                f"✅ Language set to *{lang_request}*. Your video is still processing — "
+                "ask again once the summary is ready to get it translated.",
+                parse_mode=ParseMode.MARKDOWN,
+            )
+            return
+        if session.state != "ready":
             await update.message.reply_text(
                 f"✅ Language set to *{lang_request}*. Send a YouTube link to get started!",
                 parse_mode=ParseMode.MARKDOWN,
@@ -31,15 +39,19 @@ async def handle_question(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
         loading = await update.message.reply_text(f"🌐 Translating to {lang_request}…")
         try:
-            translated = translate_summary(session.summary, lang_request)
-            sess.get_session(chat_id).summary = translated
-            await edit_or_send_long(loading, translated)
+            translated = await stream_to_message(
+                loading, translate_summary_stream(session.video_id, session.summary, lang_request)
+            )
+            session.summary = translated
         except Exception as e:
             await loading.edit_text(f"❌ Translation failed: {str(e)}")
         return
 
-    # ── No video loaded ────────────────────────────────────────────────────────
-    if not sess.has_video(chat_id):
+    # ── No video loaded (yet) ──────────────────────────────────────────────────
+    if session.state == "loading":
+        await update.message.reply_text("⏳ Still processing your video — try again in a moment.")
+        return
+    if session.state != "ready":
         await update.message.reply_text(
             "👋 Send me a YouTube link and I'll summarize it for you!\n"
             "Then you can ask me anything about the video."
@@ -50,12 +62,12 @@ async def handle_question(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     thinking = await update.message.reply_text("🤔 …")
 
     try:
-        answer = answer_question(
-            transcript=session.transcript,
+        answer = await stream_to_message(thinking, answer_question_stream(
+            transcript=session.transcript_head,
             history=session.history,
             question=question,
             language=session.language,
-        )
+        ))
     except Exception as e:
         await thinking.edit_text(f"❌ Error: {str(e)}")
         return
@@ -63,5 +75,3 @@ async def handle_question(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     # Maintain conversation history
     sess.append_history(chat_id, "user", question)
     sess.append_history(chat_id, "assistant", answer)
-
-    await edit_or_send_long(thinking, answer)
@@ -17,9 +17,12 @@ Benefits:
 """
 
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Optional
 
+from utils.text import MAX_PROMPT_TOKENS, count_words, head_tokens
+
 
 # Cache configuration
 _TTL_SECONDS = 24 * 60 * 60   # 24 hours
@@ -30,6 +33,9 @@ _MAX_ENTRIES = 200              # Max number of cached videos
 class CacheEntry:
     transcript: str
     language_code: str
+    head: Optional[str] = None        # First MAX_PROMPT_TOKENS tokens — what every prompt sends
+    word_count: int = 0
+    token_count: int = 0
     summary: Optional[str] = None     # Cached English summary (generated on first request)
     created_at: float = field(default_factory=time.time)
     last_accessed: float = field(default_factory=time.time)
@@ -43,16 +49,31 @@ class CacheEntry:
         self.access_count += 1
 
 
+def build_entry(transcript: str, language_code: str) -> CacheEntry:
+    """
+    Build a cache entry, tokenizing and truncating the transcript once so LLM
+    calls only ever touch a bounded string. CPU-heavy for long videos — call it
+    from a worker thread, not the event loop.
+    """
+    entry = CacheEntry(transcript=transcript, language_code=language_code)
+    entry.head, entry.token_count = head_tokens(transcript, MAX_PROMPT_TOKENS)
+    entry.word_count = count_words(transcript)
+    return entry
+
+
 class TranscriptCache:
     """
     LRU-TTL cache for YouTube transcripts.
     
     Key: video_id (str)
     Value: CacheEntry (transcript + optional cached summary)
+
+    Entries are kept in recency order (oldest first), so LRU updates and
+    eviction are O(1) instead of scanning the whole store.
     """
 
     def __init__(self):
-        self._store: dict[str, CacheEntry] = {}
+        self._store: OrderedDict[str, CacheEntry] = OrderedDict()
 
     def get(self, video_id: str) -> Optional[CacheEntry]:
         """Return cached entry if it exists and is not expired, else None."""
@@ -63,13 +84,14 @@ class TranscriptCache:
             del self._store[video_id]
             return None
         entry.touch()
+        self._store.move_to_end(video_id)
         return entry
 
-    def set(self, video_id: str, transcript: str, language_code: str) -> CacheEntry:
-        """Cache a transcript. Evicts LRU entries if over capacity."""
+    def set(self, video_id: str, entry: CacheEntry) -> CacheEntry:
+        """Cache a prepared entry (see build_entry). Evicts LRU entries if over capacity."""
         self._evict_if_needed()
-        entry = CacheEntry(transcript=transcript, language_code=language_code)
         self._store[video_id] = entry
+        self._store.move_to_end(video_id)
         return entry
 
     def set_summary(self, video_id: str, summary: str) -> None:
@@ -79,16 +101,19 @@ class TranscriptCache:
             entry.summary = summary
 
     def _evict_if_needed(self) -> None:
-        """Remove expired entries, then evict LRU if still over capacity."""
-        # First pass: remove expired
+        """Evict LRU entries if at capacity (O(1): the oldest entry sits at the front)."""
+        while len(self._store) >= _MAX_ENTRIES:
+            self._store.popitem(last=False)
+
+    def sweep_expired(self) -> int:
+        """
+        Remove all expired entries. Called from the periodic cleanup job so the
+        O(N) scan stays off the user request path. Returns the number removed.
+        """
         expired = [vid for vid, e in self._store.items() if e.is_expired()]
         for vid in expired:
             del self._store[vid]
-
-        # Second pass: LRU eviction if still over capacity
-        if len(self._store) >= _MAX_ENTRIES:
-            lru_key = min(self._store, key=lambda k: self._store[k].last_accessed)
-            del self._store[lru_key]
+        return len(expired)
 
     def stats(self) -> dict:
         """Return cache statistics (useful for debugging / README documentation)."""
@@ -9,24 +9,69 @@ Why Groq:
 - llama3-70b gives excellent quality
 
 Design:
-- No chunking: transcript sent in full (Llama 3 supports large context)
+- No chunking: one token-bounded transcript head (MAX_PROMPT_TOKENS) per video,
+  computed once at fetch time and sent as-is by every prompt
 - Separate summarize vs translate (translation reuses cached summary — fast)
 - Q&A: grounded strictly in transcript, conversation history maintained
+- Responses cached by prompt hash (LLMCache) — identical requests skip Groq,
+  and an identical request already in flight is awaited, not repeated
+- *_stream variants yield text as it is generated, for progressive display
+- Async client (AsyncGroq) on one pooled HTTP/2 connection — concurrent chats
+  run their LLM calls concurrently without blocking the event loop; the pool
+  keeps idle connections alive and is closed via aclose() on shutdown
 """
 
+import asyncio
+import logging
 import os
+import random
+import re
 import time
-from groq import Groq
+from itertools import islice
+from typing import AsyncIterator, Awaitable, Callable, Optional, Sequence
+
+import httpx
+from groq import AsyncGroq, RateLimitError
 from dotenv import load_dotenv
 
+from services import ratelimit
+from services.llm_cache import Uncacheable, llm_cache, make_key, memoize, memoize_stream, task_key
+from utils.aio import background_stream
+
 load_dotenv()
 
-_client = Groq(api_key=os.getenv("GROQ_API_KEY", ""))
+logger = logging.getLogger(__name__)
+
+# Long-lived keep-alive pool: idle connections (and their TLS sessions) are
+# kept for reuse, so a call after a quiet period skips the handshake
+_http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=32),
+    timeout=httpx.Timeout(60.0, connect=15.0),
+)
+# max_retries=0: the SDK's own retries (429s included) would sit underneath
+# _call()'s backoff loop — multiplying attempts, bypassing the ratelimit
+# buckets and the total wait cap, and delaying the TPD fallback
+_client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY", ""), http_client=_http_client, max_retries=0)
 _MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
 
 # Fallback model if primary exceeds rate limit (100k Tokens Per Day)
 _FALLBACK_MODEL = "llama-3.1-8b-instant"
 
+# Rate-limit retry: exponential backoff with full jitter, capped at 60s in total
+# (the only retry layer — the SDK client is built with max_retries=0)
+_MAX_ATTEMPTS = 5
+_MAX_BACKOFF_SECONDS = 60
+_MAX_RETRY_WAIT_SECONDS = 60
+
+# Output budgets per task: Groq bills and rate-limits (TPD) by output tokens,
+# so short-answer tasks get a tighter cap than full summaries/translations
+_SUMMARY_MAX_TOKENS = 2048
+_TRANSLATE_MAX_TOKENS = 2048   # translations are as long as the summary
+_QA_MAX_TOKENS = 768
+_DEEPDIVE_MAX_TOKENS = 2048
+_ACTION_POINTS_MAX_TOKENS = 512
+
 SUPPORTED_LANGUAGES = {
     "hindi": "Hindi", "हिंदी": "Hindi",
     "tamil": "Tamil", "தமிழ்": "Tamil",
@@ -36,65 +81,56 @@ SUPPORTED_LANGUAGES = {
     "english": "English",
 }
 
-
-# ─── Core LLM call ────────────────────────────────────────────────────────────
-
-def _ask(system: str, user: str) -> str:
-    """Call Groq with retry on rate limit and fallback to smaller model if TPD exceeded."""
-    models_to_try = [_MODEL, _FALLBACK_MODEL]
-
-    for model in models_to_try:
-        for attempt in range(3):
-            try:
-                response = _client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {"role": "system", "content": system},
-                        {"role": "user", "content": user},
-                    ],
-                    temperature=0.3,
-                    max_tokens=2048,
-                )
-                return response.choices[0].message.content.strip()
-            except Exception as e:
-                err_str = str(e).lower()
-                # If Tokens Per Day (TPD) is exhausted, break to try the next model
-                if "tpd" in err_str or "tokens per day" in err_str:
-                    print(f"⚠️ Rate limit (TPD) reached for {model}, falling back to next model...")
-                    break 
-                
-                # For per-minute limits (RPM/RPD/TPM), wait and retry
-                if "429" in err_str or "rate limit" in err_str:
-                    if attempt < 2:
-                        time.sleep(15)
-                        continue
-                
-                # If neither, or we exhausted retries without hitting TPD, raise
-                if attempt == 2:
-                    raise
-
-    raise RuntimeError("All Groq models are rate limited. Please wait a while and try again.")
-
-
-
-
-# ─── Language detection ───────────────────────────────────────────────────────
-
-def detect_language_request(message: str) -> str | None:
-    """Detect if user is requesting a specific language. Returns language name or None."""
-    lower = message.lower()
-    for keyword, lang in SUPPORTED_LANGUAGES.items():
-        if keyword in lower:
-            return lang
-    return None
-
-
-# ─── Summarization ────────────────────────────────────────────────────────────
-
-def summarize(transcript: str, language: str = "English") -> str:
-    """Summarize a full video transcript in the given language."""
-    system = f"""You are an expert video analyst and researcher. 
-Produce a highly detailed, comprehensive, and structured summary in {language}.
+# One precompiled alternation of all keywords (longest first): a single C-level
+# search per message, no Python loop.
+# - Latin keys match as whole words — not next to another Latin letter — which
+#   avoids "hindi" in "hindiana" but allows any punctuation ("hindi’s", "«hindi»")
+# - Native-script keys match as a whole word, optionally followed by one of the
+#   case suffixes Telugu, Kannada, Marathi and Tamil attach to the name
+#   ("తెలుగులో", "मराठीत") — but not inside longer words such as
+#   "தமிழ்நாடு" (Tamil Nadu) or "తెలుగుదేశం" (Telugu Desam).
+#   \b can't be used because it splits Indic words at vowel signs; instead a
+#   word continues while the next character is \w or in the Indic blocks
+#   (U+0900–U+0DFF, which covers vowel signs and viramas), except the dandas.
+_NATIVE_CASE_SUFFIXES = [
+    "లో", "లోకి", "లోనే",             # Telugu
+    "ದಲ್ಲಿ", "ದಲ್ಲೇ", "ಕ್ಕೆ",            # Kannada
+    "त", "तून", "ला",                 # Marathi
+    "ல", "ல்ல", "லே",                  # Tamil (colloquial)
+]
+_INDIC_WORD_CHAR = r"\w\u0900-\u0963\u0966-\u0DFF"
+
+
+def _alternation(keys: list[str]) -> str:
+    return "|".join(re.escape(k) for k in sorted(keys, key=len, reverse=True))
+
+
+# Group 1: Latin key, group 2: native-script key (suffix excluded)
+_LANG_RE = re.compile(
+    r"(?<![a-z])(" + _alternation([k for k in SUPPORTED_LANGUAGES if k.isascii()]) + r")(?![a-z])"
+    rf"|(?<![{_INDIC_WORD_CHAR}])("
+    + _alternation([k for k in SUPPORTED_LANGUAGES if not k.isascii()])
+    + r")(?:" + _alternation(_NATIVE_CASE_SUFFIXES) + rf")?(?![{_INDIC_WORD_CHAR}])",
+    re.IGNORECASE,
+)
+
+
+# ─── Prompts ──────────────────────────────────────────────────────────────────
+# Every call about a video (summary, Q&A, deep-dive, action points) sends the
+# SAME static system prompt followed by the transcript, so they all share one
+# byte-identical prefix — system prompt + transcript head — that Groq's prompt
+# caching can reuse across tasks, not just across repeats of one task.
+# Everything that varies (task instructions, history, question, language)
+# comes after the transcript. The transcript passed in is always the
+# precomputed, token-bounded head (CacheEntry.head / session.transcript_head).
+
+_VIDEO_SYSTEM = """You are an expert video analyst and research assistant.
+The user message starts with a YouTube video transcript, followed by a task.
+Work ONLY from the transcript — do NOT make up information.
+Follow the task's instructions and output format exactly, and respond in the
+language requested at the end of the user message."""
+
+_SUMMARY_TASK = """Task: produce a highly detailed, comprehensive, and structured summary.
 Output ONLY the summary — no preamble, no explanation.
 Extract as much valuable information, nuance, and context from the transcript as possible.
 
@@ -121,66 +157,360 @@ Use this exact format:
 🧠 *Final Conclusion*
 [2-3 sentences wrapping up the most important overarching theme of this video.]"""
 
-    # Groq's llama3-70b supports up to 8192 tokens — limit transcript to ~6000 tokens (~4500 words)
-    transcript_snippet = " ".join(transcript.split()[:4500])
-    return _ask(system, f"Transcript:\n{transcript_snippet}")
+_QA_TASK = """Task: answer the user's latest question based ONLY on the transcript.
+If the answer is not in the transcript, say: "❓ This topic is not covered in the video."
+Be conversational, concise, and FORMAT YOUR ANSWER NEATLY USING BULLET POINTS OR NUMBERED LISTS where appropriate."""
+
+_DEEPDIVE_TASK = "Task: provide a detailed analytical deep-dive: main themes, key arguments, evidence, observations."
+
+_ACTION_POINTS_TASK = "Task: extract every actionable recommendation and next step as a numbered list."
+
+# Translation works on the summary, not the transcript, so it shares no prefix
+# with the tasks above and keeps its own system prompt
+_TRANSLATE_SYSTEM = (
+    "You are a translator. Translate this YouTube summary into the language "
+    "requested at the end of the user message. "
+    "Keep all emojis and structure identical. Output ONLY the translated text."
+)
+
+
+def _video_prompt(transcript: str, task: str, tail: str) -> tuple[str, str]:
+    """(system, user) for a transcript task: shared prefix first, per-request parts last."""
+    return _VIDEO_SYSTEM, f"Transcript:\n{transcript}\n\n{task}\n\n{tail}"
+
+
+# ─── Rate limiting ────────────────────────────────────────────────────────────
+
+class RateLimitedError(RuntimeError):
+    """Groq is still rate limiting after all retries and the fallback model."""
+
+
+# ─── Core LLM call ────────────────────────────────────────────────────────────
+
+def _log_prompt_cache(model: str, usage) -> None:
+    """Log how many prompt tokens Groq served from its prefix cache."""
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    if not prompt_tokens:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) or getattr(usage, "cached_tokens", 0) or 0
+    logger.info(f"Groq {model}: {cached}/{prompt_tokens} prompt tokens cached ({cached / prompt_tokens:.0%})")
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before a retry: Groq's Retry-After if sent, else jittered backoff."""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    # Full jitter spreads out retries from concurrent chats so they don't re-hit the limit together
+    return random.random() * min(_MAX_BACKOFF_SECONDS, 2 ** attempt)
+
+
+# Requests currently running, keyed like llm_cache (make_key). An identical
+# prompt that arrives while one is in flight — same video, same question, same
+# history and language, e.g. a double tap or two users asking alike — awaits
+# the running request instead of making a second Groq call.
+_in_flight: dict[str, Awaitable[str]] = {}
+
+
+async def _join_in_flight(cache_key: str) -> Optional[str]:
+    """Result of an identical in-flight request, or None if there is none (or it was abandoned)."""
+    pending = _in_flight.get(cache_key)
+    if pending is None:
+        return None
+    try:
+        # shield: a waiter being cancelled must not cancel the shared request
+        return await asyncio.shield(pending)
+    except asyncio.CancelledError:
+        if pending.cancelled():
+            return None   # The owner gave up — caller makes its own request
+        raise
+
+
+async def _ask(system: str, user: str, max_tokens: int = 2048) -> str:
+    """Call Groq with retry on rate limit and fallback to smaller model if TPD exceeded."""
+    # Identical prompt already answered by the primary model? Serve it from cache
+    cache_key = make_key(_MODEL, system, user)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    joined = await _join_in_flight(cache_key)
+    if joined is not None:
+        return joined
+
+    # Run as its own task so the request survives its first caller being cancelled
+    task = asyncio.ensure_future(_call(system, user, max_tokens, cache_key))
+    _in_flight[cache_key] = task
+
+    def _forget(t: asyncio.Future) -> None:
+        if _in_flight.get(cache_key) is t:
+            del _in_flight[cache_key]
+
+    task.add_done_callback(_forget)
+    return await asyncio.shield(task)
+
+
+async def _call(system: str, user: str, max_tokens: int, cache_key: str) -> str:
+    """The Groq request behind _ask(): retries, model fallback, and caching the answer."""
+    models_to_try = [_MODEL, _FALLBACK_MODEL]
+    retry_deadline = time.monotonic() + _MAX_RETRY_WAIT_SECONDS
+
+    for model in models_to_try:
+        for attempt in range(_MAX_ATTEMPTS):
+            try:
+                async with ratelimit.concurrency:
+                    await ratelimit.acquire(system, user)
+                    response = await _client.chat.completions.create(
+                        model=model,
+                        messages=[
+                            {"role": "system", "content": system},
+                            {"role": "user", "content": user},
+                        ],
+                        temperature=0.3,
+                        max_tokens=max_tokens,
+                    )
+                text = response.choices[0].message.content.strip()
+                _log_prompt_cache(model, getattr(response, "usage", None))
+                # Only cache primary-model answers; fallback output is lower quality,
+                # and is marked so the task memo (and callers) don't keep it either
+                if model != _MODEL:
+                    return Uncacheable(text)
+                llm_cache.set(cache_key, text)
+                return text
+            except RateLimitError as e:
+                err_str = str(e).lower()
+                # If Tokens Per Day (TPD) is exhausted, break to try the next model
+                if "tpd" in err_str or "tokens per day" in err_str:
+                    logger.warning(f"Rate limit (TPD) reached for {model}, falling back to next model")
+                    break
+
+                # For per-minute limits (RPM/RPD/TPM), back off (without blocking other chats) and retry
+                delay = _retry_delay(e, attempt)
+                if attempt < _MAX_ATTEMPTS - 1 and time.monotonic() + delay <= retry_deadline:
+                    await asyncio.sleep(delay)
+                    continue
+                raise RateLimitedError(
+                    "Groq is rate limiting requests right now. Please try again in a minute."
+                ) from e
+            except Exception:
+                # Transient API/network error: retry a couple of times, then raise
+                if attempt >= 2:
+                    raise
+
+    raise RateLimitedError("All Groq models are rate limited. Please wait a while and try again.")
+
+
+async def _ask_stream(system: str, user: str, max_tokens: int = 2048) -> AsyncIterator[str]:
+    """
+    Stream a Groq completion, yielding text deltas as they arrive.
+    Cache hits are yielded in one piece. If the streaming request is rejected
+    up front (e.g. rate limit), falls back to _call() and its retry/fallback logic.
+    The Groq stream is drained by a background producer, so the concurrency
+    slot is released when Groq finishes, not when the consumer does.
+    """
+    cache_key = make_key(_MODEL, system, user)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+    joined = await _join_in_flight(cache_key)
+    if joined is not None:
+        yield joined   # Duplicates get the finished text in one piece
+        return
+
+    done = asyncio.get_running_loop().create_future()
+    _in_flight[cache_key] = done
+
+    async def produce(emit: Callable[[str], None]) -> None:
+        try:
+            parts = []
+            async for delta in _stream(system, user, max_tokens, cache_key):
+                parts.append(delta)
+                emit(delta)
+            text = "".join(parts).strip()
+            done.set_result(Uncacheable(text) if any(isinstance(p, Uncacheable) for p in parts) else text)
+        except BaseException as e:
+            # Exceptions reach waiters; a cancelled producer (e.g. shutdown)
+            # sends them off to make their own request
+            if isinstance(e, Exception):
+                done.set_exception(e)
+                done.exception()   # Mark retrieved — there may be no waiters
+            else:
+                done.cancel()
+            raise
+        finally:
+            if _in_flight.get(cache_key) is done:
+                del _in_flight[cache_key]
+
+    async for delta in background_stream(produce):
+        yield delta
+
+
+async def _stream(system: str, user: str, max_tokens: int, cache_key: str) -> AsyncIterator[str]:
+    """The Groq streaming request behind _ask_stream()."""
+    parts = []
+    async with ratelimit.concurrency:
+        await ratelimit.acquire(system, user)
+        try:
+            stream = await _client.chat.completions.create(
+                model=_MODEL,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": user},
+                ],
+                temperature=0.3,
+                max_tokens=max_tokens,
+                stream=True,
+            )
+        except Exception:
+            stream = None
+
+        if stream is not None:
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+                # Groq reports usage on the final chunk under x_groq
+                x_groq = getattr(chunk, "x_groq", None)
+                if getattr(x_groq, "usage", None) is not None:
+                    _log_prompt_cache(_MODEL, x_groq.usage)
+
+    if stream is None:
+        # Outside the semaphore: _call() acquires its own slot. Not _ask(): this
+        # request already owns cache_key in _in_flight
+        yield await _call(system, user, max_tokens, cache_key)
+        return
+    llm_cache.set(cache_key, "".join(parts).strip())
+
+
+async def aclose() -> None:
+    """Close the pooled HTTP client (called once on bot shutdown)."""
+    await _http_client.aclose()
+
+
+# ─── Language detection ───────────────────────────────────────────────────────
+
+def detect_language_request(lower: str) -> str | None:
+    """
+    Detect if user is requesting a specific language. Returns language name or None.
+    Expects already-lowercased text (route_message normalizes it once per message).
+
+    >>> [detect_language_request(t) for t in (
+    ...     "తెలుగులో చెప్పండి", "ಕನ್ನಡದಲ್ಲಿ ಹೇಳಿ", "मराठीत सांगा", "தமிழ்ல சொல்லு",
+    ...     "हिंदी में बताओ", "hindi’s fine", "english—please", "«hindi»",
+    ... )]
+    ['Telugu', 'Kannada', 'Marathi', 'Tamil', 'Hindi', 'Hindi', 'English', 'Hindi']
+    >>> [detect_language_request(t) for t in (
+    ...     "tell me about hindiana jones", "தமிழ்நாடு பற்றி என்ன சொல்கிறார்?",
+    ...     "తెలుగుదేశం పార్టీ గురించి ఏమి?", "ಕನ್ನಡಿಗ ಯಾರು?",
+    ... )]
+    [None, None, None, None]
+    """
+    match = _LANG_RE.search(lower)
+    return SUPPORTED_LANGUAGES[match.group(match.lastindex).lower()] if match else None
+
+
+# ─── Summarization ────────────────────────────────────────────────────────────
+
+def _summary_prompt(transcript: str, language: str) -> tuple[str, str]:
+    return _video_prompt(transcript, _SUMMARY_TASK, f"Write the summary in {language}.")
+
+
+async def summarize(video_id: str, transcript: str, language: str = "English") -> str:
+    """Summarize a full video transcript in the given language (memoized per video + language)."""
+    return await memoize(
+        task_key("summary", video_id, language),
+        lambda: _ask(*_summary_prompt(transcript, language), max_tokens=_SUMMARY_MAX_TOKENS),
+    )
+
+
+def summarize_stream(
+    video_id: str, transcript: str, language: str = "English"
+) -> AsyncIterator[str]:
+    """Like summarize(), but yields the summary incrementally."""
+    return memoize_stream(
+        task_key("summary", video_id, language),
+        lambda: _ask_stream(*_summary_prompt(transcript, language), max_tokens=_SUMMARY_MAX_TOKENS),
+    )
 
 
 # ─── Translation ──────────────────────────────────────────────────────────────
 
-def translate_summary(summary: str, target_language: str) -> str:
-    """Translate an existing summary — much faster than re-summarizing."""
-    return _ask(
-        f"You are a translator. Translate this YouTube summary into {target_language}. "
-        f"Keep all emojis and structure identical. Output ONLY the translated text.",
-        summary
+def _translate_prompt(summary: str, target_language: str) -> tuple[str, str]:
+    return _TRANSLATE_SYSTEM, f"{summary}\n\nTranslate into {target_language}."
+
+
+def translate_summary_stream(video_id: str, summary: str, target_language: str) -> AsyncIterator[str]:
+    """
+    Translate an existing summary — much faster than re-summarizing — yielding
+    it incrementally (memoized per video + language).
+    """
+    return memoize_stream(
+        task_key("translation", video_id, target_language),
+        lambda: _ask_stream(*_translate_prompt(summary, target_language), max_tokens=_TRANSLATE_MAX_TOKENS),
     )
 
 
 # ─── Q&A ──────────────────────────────────────────────────────────────────────
 
-def answer_question(
+def _qa_prompt(
     transcript: str,
-    history: list[dict],
+    history: Sequence[dict],
     question: str,
-    language: str = "English",
-) -> str:
-    """Answer questions strictly grounded in the transcript."""
+    language: str,
+) -> tuple[str, str]:
     history_text = ""
-    for msg in history[-8:]:
+    for msg in islice(history, max(0, len(history) - 8), None):   # deques don't slice
         role = "User" if msg["role"] == "user" else "Bot"
         history_text += f"{role}: {msg['content']}\n"
 
-    # Limit transcript to fit in context window
-    transcript_snippet = " ".join(transcript.split()[:4000])
+    return _video_prompt(
+        transcript,
+        _QA_TASK,
+        f"Conversation so far:\n{history_text}\nUser: {question}\n\nRespond in {language}.",
+    )
 
-    system = f"""You are a helpful video assistant. Answer questions based ONLY on the transcript.
-If the answer is not in the transcript, say: "❓ This topic is not covered in the video."
-Do NOT make up information. Be conversational, concise, and FORMAT YOUR ANSWER NEATLY USING BULLET POINTS OR NUMBERED LISTS where appropriate. Respond in {language}."""
 
-    user_msg = f"""Transcript:
-{transcript_snippet}
+def answer_question_stream(
+    transcript: str,
+    history: Sequence[dict],
+    question: str,
+    language: str = "English",
+) -> AsyncIterator[str]:
+    """Answer a question strictly grounded in the transcript, yielding the answer incrementally."""
+    return _ask_stream(*_qa_prompt(transcript, history, question, language), max_tokens=_QA_MAX_TOKENS)
+
 
-Conversation so far:
-{history_text}
-User: {question}"""
+# ─── Bonus ────────────────────────────────────────────────────────────────────
 
-    return _ask(system, user_msg)
+def _deepdive_prompt(transcript: str, language: str) -> tuple[str, str]:
+    return _video_prompt(transcript, _DEEPDIVE_TASK, f"Respond in {language}.")
 
 
-# ─── Bonus ────────────────────────────────────────────────────────────────────
+def _action_points_prompt(transcript: str, language: str) -> tuple[str, str]:
+    return _video_prompt(transcript, _ACTION_POINTS_TASK, f"Respond in {language}.")
+
 
-def deepdive(transcript: str, language: str = "English") -> str:
-    snippet = " ".join(transcript.split()[:4000])
-    return _ask(
-        f"Provide a detailed analytical deep-dive in {language}: main themes, key arguments, evidence, observations.",
-        f"Transcript:\n{snippet}"
+def deepdive_stream(
+    video_id: str, transcript: str, language: str = "English"
+) -> AsyncIterator[str]:
+    """Deep analysis of the video, yielded incrementally (memoized per video + language)."""
+    return memoize_stream(
+        task_key("deepdive", video_id, language),
+        lambda: _ask_stream(*_deepdive_prompt(transcript, language), max_tokens=_DEEPDIVE_MAX_TOKENS),
     )
 
 
-def action_points(transcript: str, language: str = "English") -> str:
-    snippet = " ".join(transcript.split()[:4000])
-    return _ask(
-        f"Extract every actionable recommendation and next step as a numbered list in {language}.",
-        f"Transcript:\n{snippet}"
+def action_points_stream(
+    video_id: str, transcript: str, language: str = "English"
+) -> AsyncIterator[str]:
+    """Actionable items from the video, yielded incrementally (memoized per video + language)."""
+    return memoize_stream(
+        task_key("action_points", video_id, language),
+        lambda: _ask_stream(*_action_points_prompt(transcript, language), max_tokens=_ACTION_POINTS_MAX_TOKENS),
     )
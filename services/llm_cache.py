@@ -0,0 +1,180 @@
+"""
+services/llm_cache.py
+Global LLM response cache — shared across all users.
+
+Architecture Decision:
+- Caching level: exact prompt (model + system + user), not per-user, so if
+  10 users load the same video in the same language, Groq is called ONCE.
+- Key: 64-bit xxh3 hash of the prompt, so large transcripts are not kept as
+  dict keys (non-security key; 2^-64 collision risk is acceptable)
+- TTL: 24 hours (temperature is low; outputs are effectively stable)
+- Max size: 500 responses (LRU eviction when full)
+- Can be disabled with LLM_CACHE_ENABLED=false (e.g. while tuning prompts)
+- Second layer: task-level memo keyed by (task, video_id, language) for
+  summary / translation / deepdive / action points. A hit skips even building
+  the prompt, and a per-key lock (KeyedLock) collapses concurrent requests for the
+  same key into ONE Groq call instead of a stampede.
+- Results marked Uncacheable (fallback-model answers) are passed through but
+  never memoized, so the primary model is asked again next time.
+
+Benefits:
+- Cache hits return instantly instead of waiting seconds for the LLM
+- Saves Groq tokens-per-day quota on repeat requests
+"""
+
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+import xxhash
+from dotenv import load_dotenv
+
+from utils.aio import KeyedLock, background_stream
+
+load_dotenv()
+
+# Cache configuration
+_TTL_SECONDS = 24 * 60 * 60   # 24 hours
+_MAX_ENTRIES = 500              # Max number of cached responses
+_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+@dataclass
+class LLMCacheEntry:
+    text: str
+    created_at: float = field(default_factory=time.time)
+    access_count: int = 0
+
+    def is_expired(self) -> bool:
+        return (time.time() - self.created_at) > _TTL_SECONDS
+
+
+def make_key(model: str, system: str, user: str) -> str:
+    """Return a stable content hash for a single LLM request."""
+    # NUL separators keep ("ab", "c") and ("a", "bc") distinct
+    payload = f"{model}\0{system}\0{user}"
+    return xxhash.xxh3_64(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    LRU-TTL cache for LLM responses.
+
+    Key: content hash from make_key()
+    Value: LLMCacheEntry (response text)
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._store: OrderedDict[str, LLMCacheEntry] = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response if it exists and is not expired, else None."""
+        if not self.enabled:
+            return None
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        if entry.is_expired():
+            del self._store[key]
+            return None
+        entry.access_count += 1
+        self._store.move_to_end(key)
+        return entry.text
+
+    def set(self, key: str, text: str) -> None:
+        """Cache a response. Evicts the LRU entry if over capacity."""
+        if not self.enabled:
+            return
+        self._store[key] = LLMCacheEntry(text=text)
+        self._store.move_to_end(key)
+        while len(self._store) > _MAX_ENTRIES:
+            self._store.popitem(last=False)
+
+    def sweep_expired(self) -> int:
+        """Remove all expired entries (periodic cleanup job). Returns the number removed."""
+        expired = [k for k, e in self._store.items() if e.is_expired()]
+        for k in expired:
+            del self._store[k]
+        return len(expired)
+
+    def stats(self) -> dict:
+        """Return cache statistics (useful for debugging)."""
+        valid = [e for e in self._store.values() if not e.is_expired()]
+        return {
+            "enabled": self.enabled,
+            "total_entries": len(valid),
+            "max_entries": _MAX_ENTRIES,
+            "ttl_hours": _TTL_SECONDS // 3600,
+            "total_hits": sum(e.access_count for e in valid),
+        }
+
+
+# Singleton — import this everywhere
+llm_cache = LLMCache(enabled=_ENABLED)
+
+
+# ── Task-level memo ───────────────────────────────────────────────────────────
+
+class Uncacheable(str):
+    """A result that must not be memoized (e.g. a lower-quality fallback-model answer)."""
+
+
+task_cache = LLMCache(enabled=_ENABLED)
+_task_locks = KeyedLock()
+
+
+def task_key(task: str, video_id: str, language: str) -> str:
+    """Memo key for a per-video task result (e.g. "summary", "deepdive")."""
+    return f"{task}\0{video_id}\0{language}"
+
+
+async def memoize(key: str, compute: Callable[[], Awaitable[str]]) -> str:
+    """
+    Return the memoized result for key, calling compute() on a miss.
+    Concurrent callers with the same key wait for the first one's result.
+    """
+    cached = task_cache.get(key)
+    if cached is not None:
+        return cached
+
+    async with _task_locks.hold(key):
+        cached = task_cache.get(key)   # Filled while we were waiting?
+        if cached is not None:
+            return cached
+        result = await compute()
+        if not isinstance(result, Uncacheable):
+            task_cache.set(key, result)
+        return result
+
+
+async def memoize_stream(
+    key: str, stream: Callable[[], AsyncIterator[str]]
+) -> AsyncIterator[str]:
+    """
+    Streaming counterpart of memoize(): hits are yielded in one piece.
+    The per-key lock is held by a background producer, so it is released when
+    the result is complete rather than after the consumer has displayed it.
+    """
+    cached = task_cache.get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    async def produce(emit: Callable[[str], None]) -> None:
+        async with _task_locks.hold(key):
+            cached = task_cache.get(key)
+            if cached is not None:
+                emit(cached)
+                return
+            parts = []
+            async for delta in stream():
+                parts.append(delta)
+                emit(delta)
+            if not any(isinstance(p, Uncacheable) for p in parts):
+                task_cache.set(key, "".join(parts).strip())
+
+    async for delta in background_stream(produce):
+        yield delta
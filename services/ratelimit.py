@@ -0,0 +1,89 @@
+"""
+services/ratelimit.py
+Client-side rate limiting for Groq — shared by every LLM call in the process.
+
+Architecture Decision:
+- Proactive, not reactive: the bot waits for its own budget instead of firing
+  requests and discovering the limit through 429 errors
+- Two budgets, both token buckets refilled continuously over 60s:
+    * requests per minute (GROQ_RPM, free tier: 30)
+    * prompt tokens per minute (GROQ_TPM), estimated as len(text) // 4
+- Concurrency cap: at most GROQ_CONCURRENCY requests in flight at once
+- No locks: asyncio is single-threaded and check-and-take has no await in between
+
+Benefits:
+- Bursts from many chats queue smoothly instead of cascading into retries
+- Token-per-minute usage stays predictable for long transcripts
+"""
+
+import asyncio
+import os
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Limiter configuration
+_CONCURRENCY = int(os.getenv("GROQ_CONCURRENCY", "8"))    # max in-flight requests
+_REQUESTS_PER_MINUTE = int(os.getenv("GROQ_RPM", "30"))    # Groq free tier: 30 req/min
+_TOKENS_PER_MINUTE = int(os.getenv("GROQ_TPM", "30000"))   # estimated prompt tokens/min
+
+
+class TokenBucket:
+    """
+    Token bucket holding up to `per_minute` units, refilled continuously at
+    per_minute / 60 units per second.
+    """
+
+    def __init__(self, per_minute: int):
+        self._capacity = float(per_minute)
+        self._tokens = float(per_minute)
+        self._fill_rate = per_minute / 60.0
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._fill_rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait until `amount` units are available, then take them."""
+        amount = min(amount, self._capacity)   # an oversized request must still fit eventually
+        while True:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return
+            await asyncio.sleep((amount - self._tokens) / self._fill_rate)
+
+    def available(self) -> float:
+        """Units that could be taken right now without waiting."""
+        self._refill()
+        return self._tokens
+
+
+concurrency = asyncio.Semaphore(_CONCURRENCY)
+request_limiter = TokenBucket(_REQUESTS_PER_MINUTE)
+token_limiter = TokenBucket(_TOKENS_PER_MINUTE)
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Cheap token estimate (~4 characters per token) — no tokenizer needed."""
+    return sum(len(t) for t in texts) // 4 + 1
+
+
+async def acquire(system: str, user: str) -> None:
+    """Wait for both a request slot and enough prompt-token budget for this call."""
+    await request_limiter.acquire()
+    await token_limiter.acquire(estimate_tokens(system, user))
+
+
+def current_capacity() -> dict:
+    """Return the remaining per-minute budget (useful for debugging / a /stats command)."""
+    return {
+        "requests": int(request_limiter.available()),
+        "requests_per_minute": _REQUESTS_PER_MINUTE,
+        "tokens": int(token_limiter.available()),
+        "tokens_per_minute": _TOKENS_PER_MINUTE,
+    }
@@ -6,36 +6,72 @@ Architecture Decision:
 - Scope: one session per Telegram chat_id (supports multiple users simultaneously)
 - Storage: in-memory dict (no database — acceptable for this scale)
 - TTL: 2 hours of inactivity → session auto-expires (saves memory)
-- History limit: last 20 messages (10 exchanges) — keeps token cost bounded
-- Transcript storage: session stores video_id reference; full transcript in
-  TranscriptCache (shared) to avoid duplicating large strings per session
-- Cleanup: passive (on access) + periodic cleanup via cleanup_expired()
+- History limit: last 20 messages (10 exchanges) — keeps token cost bounded;
+  a deque(maxlen=20) drops the oldest message on append in O(1)
+- Transcript storage: session holds a reference to the shared TranscriptCache
+  entry, so large transcript strings are never duplicated per session
+- Cleanup: passive (on access) + periodic cleanup via cleanup_expired(), which
+  pops a min-heap of (last_active, chat_id) instead of scanning every session
+- State: explicit empty → loading → ready flag, so commands never see a
+  half-loaded video (e.g. video_id set but summary still being generated)
 """
 
+import heapq
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Literal, Optional
+
+from services.cache import CacheEntry
 
 # Session configuration
 _SESSION_TTL_SECONDS = 2 * 60 * 60   # 2 hours of inactivity
 _MAX_HISTORY_MESSAGES = 20            # ~10 back-and-forth exchanges
 
+SessionState = Literal["empty", "loading", "ready"]
+
 
 @dataclass
 class UserSession:
     # Video context
     video_id: Optional[str] = None
-    transcript: Optional[str] = None      # Full transcript text
+    entry: Optional[CacheEntry] = None    # Shared TranscriptCache entry — never a per-session copy
     summary: Optional[str] = None         # Generated/cached summary
     language: str = "English"             # User's preferred response language
+    state: SessionState = "empty"         # "ready" once video + summary are stored
+    loads_in_flight: int = 0              # Links still being summarized (concurrent updates)
 
     # Conversation history (bounded, for Q&A follow-ups)
-    history: list[dict] = field(default_factory=list)
+    history: deque[dict] = field(default_factory=lambda: deque(maxlen=_MAX_HISTORY_MESSAGES))
 
     # Session lifecycle
     created_at: float = field(default_factory=time.time)
     last_active: float = field(default_factory=time.time)
 
+    def get_transcript(self) -> Optional[str]:
+        """Full transcript text of the loaded video, if any."""
+        return self.entry.transcript if self.entry else None
+
+    @property
+    def transcript_head(self) -> Optional[str]:
+        """Prompt-sized head of the transcript (what the LLM calls use)."""
+        return self.entry.head if self.entry else None
+
+    def begin_load(self) -> None:
+        """Mark a new video as loading (paired with end_load())."""
+        self.loads_in_flight += 1
+        self.state = "loading"
+
+    def end_load(self) -> None:
+        """
+        Finish one load, successful or not. When no other load is still running,
+        the state is derived from what the session actually holds — never restored
+        from a snapshot, which may itself have been "loading".
+        """
+        self.loads_in_flight -= 1
+        if self.loads_in_flight == 0 and self.state == "loading":
+            self.state = "ready" if self.video_id and self.summary else "empty"
+
     def touch(self) -> None:
         """Update last_active timestamp on any user interaction."""
         self.last_active = time.time()
@@ -45,18 +81,16 @@ class UserSession:
         return (time.time() - self.last_active) > _SESSION_TTL_SECONDS
 
     def add_history(self, role: str, content: str) -> None:
-        """Append a message to conversation history, enforcing the max limit."""
+        """Append a message to conversation history (maxlen drops the oldest)."""
         self.history.append({"role": role, "content": content})
-        # Keep only the most recent messages (trim from the front)
-        if len(self.history) > _MAX_HISTORY_MESSAGES:
-            self.history = self.history[-_MAX_HISTORY_MESSAGES:]
 
     def reset(self) -> None:
         """Clear video context and conversation history (used by /reset)."""
         self.video_id = None
-        self.transcript = None
+        self.entry = None
         self.summary = None
-        self.history = []
+        self.state = "empty"
+        self.history.clear()
         self.touch()
 
 
@@ -64,6 +98,19 @@ class UserSession:
 
 _sessions: dict[int, UserSession] = {}
 
+# Exactly one (last_active, chat_id) entry per chat_id in _sessions. Touches do
+# not push — a popped entry whose session was active since is re-pushed instead.
+_expiry_heap: list[tuple[float, int]] = []
+
+
+def _new_session(chat_id: int) -> UserSession:
+    """Store a fresh session for chat_id, indexing it in the expiry heap if new."""
+    session = UserSession()
+    if chat_id not in _sessions:
+        heapq.heappush(_expiry_heap, (session.last_active, chat_id))
+    _sessions[chat_id] = session
+    return session
+
 
 def get_session(chat_id: int) -> UserSession:
     """
@@ -73,22 +120,29 @@ def get_session(chat_id: int) -> UserSession:
     session = _sessions.get(chat_id)
     if session is None or session.is_expired():
         # Expired or new user — start fresh
-        _sessions[chat_id] = UserSession()
-    else:
-        _sessions[chat_id].touch()
-    return _sessions[chat_id]
+        return _new_session(chat_id)
+    session.touch()
+    return session
 
 
-def update_video(chat_id: int, video_id: str, transcript: str, summary: str) -> None:
+def update_video(
+    chat_id: int,
+    video_id: str,
+    entry: CacheEntry,
+    summary: str,
+) -> None:
     """
     Store new video context for a session.
     Resets Q&A history since it's a new video.
     """
     session = get_session(chat_id)
     session.video_id = video_id
-    session.transcript = transcript
+    # Holding the entry (not just video_id) keeps it alive for this session even
+    # if TranscriptCache evicts it; the strings themselves are never copied
+    session.entry = entry
     session.summary = summary
-    session.history = []  # Fresh history for new video
+    session.state = "ready"
+    session.history.clear()  # Fresh history for new video
     session.touch()
 
 
@@ -102,20 +156,12 @@ def append_history(chat_id: int, role: str, content: str) -> None:
     get_session(chat_id).add_history(role, content)
 
 
-def has_video(chat_id: int) -> bool:
-    """Return True if the session has an active video loaded."""
-    session = _sessions.get(chat_id)
-    if session is None or session.is_expired():
-        return False
-    return session.transcript is not None
-
-
 def clear_session(chat_id: int) -> None:
     """Reset session context (/reset command)."""
     if chat_id in _sessions:
         _sessions[chat_id].reset()
     else:
-        _sessions[chat_id] = UserSession()
+        _new_session(chat_id)
 
 
 def cleanup_expired() -> int:
@@ -124,10 +170,20 @@ def cleanup_expired() -> int:
     Intended to be called periodically (e.g., from a scheduled job).
     Returns the number of sessions removed.
     """
-    expired_ids = [cid for cid, s in _sessions.items() if s.is_expired()]
-    for cid in expired_ids:
-        del _sessions[cid]
-    return len(expired_ids)
+    cutoff = time.time() - _SESSION_TTL_SECONDS
+    removed = 0
+    while _expiry_heap and _expiry_heap[0][0] < cutoff:
+        _, cid = heapq.heappop(_expiry_heap)
+        session = _sessions.get(cid)
+        if session is None:
+            continue
+        if session.last_active < cutoff:
+            del _sessions[cid]
+            removed += 1
+        else:
+            # Touched since this entry was pushed — reschedule at its real time
+            heapq.heappush(_expiry_heap, (session.last_active, cid))
+    return removed
 
 
 def active_session_count() -> int:
@@ -6,8 +6,18 @@ Design:
 - Returns full transcript as plain text — no chunking
 - Gemini 2.0 Flash handles up to 1M tokens; even a 3-hour video fits easily
 - Graceful error handling with user-friendly messages
+- get_transcript() is async and backed by the shared TranscriptCache: the
+  blocking API call runs in a worker thread, and concurrent first-time
+  requests for the same video coalesce into ONE fetch (per-video lock)
+- One pooled keep-alive requests.Session for every fetch, so repeat calls to
+  YouTube reuse open connections instead of paying a TLS handshake each time
 """
 
+import asyncio
+from operator import attrgetter
+
+import requests
+from requests.adapters import HTTPAdapter
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import (
     TranscriptsDisabled,
@@ -15,15 +25,48 @@ from youtube_transcript_api._errors import (
     VideoUnavailable,
 )
 
-_api = YouTubeTranscriptApi()
+from services.cache import CacheEntry, build_entry, transcript_cache
+from utils.aio import KeyedLock
+
+# Pool sized for the default asyncio.to_thread worker count on small hosts
+_POOL_SIZE = 16
+
+_http_session = requests.Session()
+_http_session.mount("https://", HTTPAdapter(pool_connections=_POOL_SIZE, pool_maxsize=_POOL_SIZE))
+_api = YouTubeTranscriptApi(http_client=_http_session)
+_snippet_text = attrgetter("text")
+_fetch_locks = KeyedLock()
 
 
-def get_transcript(video_id: str) -> tuple[str, str]:
+async def get_transcript(video_id: str) -> CacheEntry:
+    """
+    Return the transcript for a YouTube video, from cache or freshly fetched.
+    A fresh fetch is stored in transcript_cache for future requests.
+
+    Raises:
+        ValueError with a user-friendly message on failure.
     """
-    Fetch the full transcript for a YouTube video.
+    cached = transcript_cache.get(video_id)
+    if cached:
+        return cached
+
+    async with _fetch_locks.hold(video_id):
+        cached = transcript_cache.get(video_id)   # Fetched while we were waiting?
+        if cached:
+            return cached
+        # Fetch and tokenize in the worker thread — both block for long videos
+        entry = await asyncio.to_thread(_fetch_transcript, video_id)
+        return transcript_cache.set(video_id, entry)
+
 
-    Returns:
-        (full_text, language_code)
+def close() -> None:
+    """Close the pooled HTTP session (called once on bot shutdown)."""
+    _http_session.close()
+
+
+def _fetch_transcript(video_id: str) -> CacheEntry:
+    """
+    Fetch the full transcript for a YouTube video and prepare its cache entry (blocking).
 
     Raises:
         ValueError with a user-friendly message on failure.
@@ -46,8 +89,10 @@ def get_transcript(video_id: str) -> tuple[str, str]:
 
         fetched = transcript.fetch()
         language_code = transcript.language_code
-        full_text = " ".join(entry.text for entry in fetched)
-        return full_text.strip(), language_code
+        # One C-level pass over the snippet list — no generator frame per snippet.
+        # (to_raw_data() would be slower: it builds a dict per snippet via asdict)
+        full_text = " ".join(map(_snippet_text, fetched.snippets))
+        return build_entry(full_text.strip(), language_code)
 
     except TranscriptsDisabled:
         raise ValueError("❌ Transcripts are disabled for this video.")
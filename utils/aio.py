@@ -0,0 +1,67 @@
+"""
+utils/aio.py
+Small asyncio building blocks shared by the services.
+"""
+
+import asyncio
+import contextlib
+from typing import AsyncIterator, Awaitable, Callable
+
+
+class KeyedLock:
+    """
+    One asyncio.Lock per key, created on demand and dropped once unused.
+
+    Each key's lock is reference-counted: callers waiting for it count too, so
+    it is only removed when nobody holds or awaits it. (Dropping it as soon as
+    it is momentarily unlocked would let a newcomer create a second lock for
+    the same key while woken waiters are still about to take the first.)
+    """
+
+    def __init__(self):
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._users: dict[str, int] = {}   # holders + waiters per key
+
+    @contextlib.asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        """Hold the lock for key for the duration of the `async with` block."""
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._users[key] = self._users.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._users[key] -= 1
+            if self._users[key] == 0:
+                del self._users[key], self._locks[key]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+
+async def background_stream(
+    produce: Callable[[Callable[[str], None]], Awaitable[None]],
+) -> AsyncIterator[str]:
+    """
+    Run produce(emit) as its own task and yield everything it emits.
+
+    The producer never waits for the consumer: emitted items are buffered, so
+    whatever the producer holds (a semaphore slot, a per-key lock, an upstream
+    HTTP stream) is released as soon as the upstream work is done — not after
+    the consumer's slow Telegram edits, and not only once an abandoned
+    consumer generator happens to be finalized. An abandoned producer still
+    runs to completion. Its exception, if any, is re-raised to the consumer.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    end = object()
+
+    def _finished(task: asyncio.Future) -> None:
+        if not task.cancelled():
+            task.exception()   # Mark retrieved — the consumer may be gone
+        queue.put_nowait(end)
+
+    task = asyncio.ensure_future(produce(queue.put_nowait))
+    task.add_done_callback(_finished)
+    while (item := await queue.get()) is not end:
+        yield item
+    await task   # Re-raise the producer's exception, if any
@@ -1,77 +1,119 @@
 # utils/telegram_helpers.py
 """Helper utilities for Telegram messaging."""
 
+import asyncio
+import time
+from typing import AsyncIterator
+
 from telegram import Message
 from telegram.constants import ParseMode
+from telegram.error import RetryAfter
 
 MAX_MSG_LEN = 4000  # Telegram limit is 4096; keep buffer
+STREAM_EDIT_INTERVAL = 1.2  # seconds between progressive edits (Telegram allows ~1/s)
 
 
-async def send_long_message(message: Message, text: str) -> None:
+def _split_chunks(text: str, limit: int = MAX_MSG_LEN) -> list[str]:
     """
-    Send a potentially long text, splitting into chunks if needed.
-    Uses MarkdownV2-safe plain send for overflow chunks.
+    Split text into chunks of at most `limit` characters, breaking at newlines.
+    Lines are buffered and joined once per chunk (linear, not quadratic).
     """
-    if len(text) <= MAX_MSG_LEN:
-        try:
-            await message.reply_text(text, parse_mode=ParseMode.MARKDOWN)
-        except Exception:
-            await message.reply_text(text)  # fallback without markdown
-        return
-
-    # Split into chunks at newlines where possible
     chunks = []
-    current = ""
+    buf: list[str] = []
+    size = 0   # len("\n".join(buf))
     for line in text.split("\n"):
-        if len(current) + len(line) + 1 > MAX_MSG_LEN:
-            if current:
-                chunks.append(current)
-            current = line
-        else:
-            current = current + "\n" + line if current else line
-    if current:
-        chunks.append(current)
-
-    for chunk in chunks:
-        try:
-            await message.reply_text(chunk, parse_mode=ParseMode.MARKDOWN)
-        except Exception:
-            await message.reply_text(chunk)
+        if buf and size + len(line) + 1 > limit:
+            chunks.append("\n".join(buf))
+            buf, size = [], 0
+        if not buf and not line:
+            continue   # Never start a chunk with blank lines
+        size += len(line) + 1 if buf else len(line)
+        buf.append(line)
+    if buf:
+        chunks.append("\n".join(buf))
+    # Telegram rejects whitespace-only messages
+    return [c for c in chunks if c.strip()]
+
+
+async def _reply(message: Message, text: str) -> None:
+    """Reply with Markdown, falling back to plain text if Telegram rejects it."""
+    try:
+        await message.reply_text(text, parse_mode=ParseMode.MARKDOWN)
+    except Exception:
+        await message.reply_text(text)  # fallback without markdown
+
+
+async def _edit(message: Message, text: str) -> None:
+    """Edit with Markdown, falling back to plain text if Telegram rejects it."""
+    try:
+        await message.edit_text(text, parse_mode=ParseMode.MARKDOWN)
+    except Exception:
+        await message.edit_text(text)
 
 
 async def edit_or_send_long(loading_msg: Message, text: str) -> None:
     """
     Edit the loading message with the first chunk,
-    then send additional messages for remaining chunks.
+    then send additional messages for remaining chunks (one after another,
+    so they arrive in order).
     """
-    if len(text) <= MAX_MSG_LEN:
-        try:
-            await loading_msg.edit_text(text, parse_mode=ParseMode.MARKDOWN)
-        except Exception:
-            await loading_msg.edit_text(text)
-        return
+    chunks = _split_chunks(text) or [text]
+    await _edit(loading_msg, chunks[0])
+    for chunk in chunks[1:]:
+        await _reply(loading_msg, chunk)
 
-    # Split into chunks
-    chunks = []
-    current = ""
-    for line in text.split("\n"):
-        if len(current) + len(line) + 1 > MAX_MSG_LEN:
-            if current:
-                chunks.append(current)
-            current = line
-        else:
-            current = current + "\n" + line if current else line
-    if current:
-        chunks.append(current)
-
-    # Edit loading message with first chunk, send rest as new messages
-    try:
-        await loading_msg.edit_text(chunks[0], parse_mode=ParseMode.MARKDOWN)
-    except Exception:
-        await loading_msg.edit_text(chunks[0])
 
-    for chunk in chunks[1:]:
+def _retry_after_seconds(error: RetryAfter) -> float:
+    """RetryAfter.retry_after may be an int or a timedelta depending on PTB settings."""
+    delay = error.retry_after
+    return delay.total_seconds() if hasattr(delay, "total_seconds") else float(delay)
+
+
+async def stream_to_message(loading_msg: Message, deltas: AsyncIterator[str]) -> str:
+    """
+    Show an LLM response as it is generated.
+
+    Consumes an async stream of text deltas and coalesces them: the loading
+    message is edited at most once every STREAM_EDIT_INTERVAL seconds, and
+    not at all while Telegram's flood control is active. Intermediate edits
+    are plain text (partial Markdown would be rejected); the final edit via
+    edit_or_send_long applies Markdown. Returns the full text.
+    """
+    parts = []
+    shown = ""
+    next_edit_at = time.monotonic() + STREAM_EDIT_INTERVAL
+    flood_until = 0.0
+    async for delta in deltas:
+        parts.append(delta)
+
+        now = time.monotonic()
+        if now < next_edit_at:
+            continue
+        next_edit_at = now + STREAM_EDIT_INTERVAL
+
+        preview = "".join(parts)[: MAX_MSG_LEN - 2]
+        if preview == shown:
+            continue
         try:
-            await loading_msg.reply_text(chunk, parse_mode=ParseMode.MARKDOWN)
+            await loading_msg.edit_text(preview + " ▌", parse_mode=None)
+            shown = preview
+        except RetryAfter as e:
+            # Keep consuming the stream; just hold edits until Telegram allows them again
+            flood_until = now + _retry_after_seconds(e)
+            next_edit_at = flood_until
         except Exception:
-            await loading_msg.reply_text(chunk)
+            pass  # A skipped progress update is harmless
+
+    # The final flush must not be swallowed by a pending flood wait
+    delay = flood_until - time.monotonic()
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+    text = "".join(parts).strip()
+    # Deltas may carry a str subclass marker (llm_cache.Uncacheable for
+    # fallback-model output) — keep it on the result so callers can check it
+    marker = next((type(p) for p in parts if type(p) is not str), None)
+    if marker is not None:
+        text = marker(text)
+    await edit_or_send_long(loading_msg, text)
+    return text
@@ -0,0 +1,40 @@
+"""
+utils/text.py
+Cheap helpers for bounding transcript text before it goes into a prompt.
+
+Prompts are bounded in real tokens, not words: words-as-tokens has to clamp
+conservatively and throws away 10-20% of usable context on typical speech.
+cl100k_base is an approximation of the Llama 3 tokenizer (whose vocabulary
+extends it), close enough for budgeting. The encoding is loaded lazily on the
+first transcript: tiktoken downloads its BPE file on first use unless it is
+already in TIKTOKEN_CACHE_DIR, and importing this module must not need network.
+"""
+
+import functools
+import re
+
+import tiktoken
+
+_WORD_RE = re.compile(r"\S+")
+
+MAX_PROMPT_TOKENS = 6000  # Transcript budget shared by every prompt
+
+
+@functools.lru_cache(maxsize=None)
+def _encoding() -> tiktoken.Encoding:
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def head_tokens(text: str, n: int) -> tuple[str, int]:
+    """
+    Return (first n tokens of text, total token count). Encodes text once —
+    call it once per video (off the event loop) and reuse the result.
+    """
+    encoding = _encoding()
+    ids = encoding.encode(text, disallowed_special=())
+    return encoding.decode(ids[:n]), len(ids)
+
+
+def count_words(text: str) -> int:
+    """Count whitespace-separated words without materializing them in a list."""
+    return sum(1 for _ in _WORD_RE.finditer(text))
@@ -5,10 +5,11 @@ Extract YouTube video ID from various URL formats.
 
 import re
 
-# Matches all common YouTube URL formats
+# Matches all common YouTube URL formats. The scheme/"www." prefix is optional
+# and never captured, so the pattern starts at the literal "youtu" instead —
+# the regex engine can then jump straight to candidate positions.
 _YT_REGEX = re.compile(
-    r"(?:https?://)?(?:www\.)?"
-    r"(?:youtube\.com/(?:watch\?(?:.*&)?v=|shorts/|embed/|v/)|youtu\.be/)"
+    r"youtu(?:be\.com/(?:watch\?(?:.*&)?v=|shorts/|embed/|v/)|\.be/)"
     r"([a-zA-Z0-9_-]{11})"
 )
 
@@ -23,6 +24,10 @@ def extract_video_id(text: str) -> str | None:
       - https://www.youtube.com/shorts/VIDEO_ID
       - https://www.youtube.com/embed/VIDEO_ID
     """
+    # Fast reject: most messages in a session are questions, not links
+    # (case-sensitive, exactly like the regex itself)
+    if "youtu" not in text:
+        return None
     match = _YT_REGEX.search(text)
     return match.group(1) if match else None
 